@@ -80,7 +80,7 @@ MAESTRO.set_speed(RIGHT_GRIP, 200)
 
 
 def retract_top():
-    MAESTRO.set_target(TOP_ARM, TOP_FLUSH)
+    MAESTRO.set_target(TOP_ARM, TOP_FLUSH, True)
     time.sleep(DELAY)
 
 def retract_bottom():
@@ -88,59 +88,55 @@ def retract_bottom():
         extend_left()
     if MAESTRO.get_position(RIGHT_ARM) != RIGHT_FORWARD:
         extend_right()
-    MAESTRO.set_target(BOTTOM_ARM, BOTTOM_FLUSH)
+    MAESTRO.set_target(BOTTOM_ARM, BOTTOM_FLUSH, True)
     time.sleep(DELAY)    
 
 def retract_left():
     if MAESTRO.get_position(BOTTOM_ARM) != BOTTOM_FORWARD:
         extend_bottom()
-    MAESTRO.set_target(LEFT_ARM, LEFT_FLUSH)
+    MAESTRO.set_target(LEFT_ARM, LEFT_FLUSH, True)
     time.sleep(DELAY)
 
 def retract_right():
     if MAESTRO.get_position(BOTTOM_ARM) != BOTTOM_FORWARD:
         extend_bottom()
-    MAESTRO.set_target(RIGHT_ARM, RIGHT_FLUSH)
+    MAESTRO.set_target(RIGHT_ARM, RIGHT_FLUSH, True)
     time.sleep(DELAY)
 
 def retract_sides():
-    MAESTRO.set_target(RIGHT_ARM, RIGHT_FLUSH, False)
-    MAESTRO.set_target(LEFT_ARM, LEFT_FLUSH)
+    MAESTRO.execute_sequence([(RIGHT_ARM, RIGHT_FLUSH), (LEFT_ARM, LEFT_FLUSH)])
     time.sleep(DELAY)
 
 def retract_verticals():
-    MAESTRO.set_target(TOP_ARM, TOP_FLUSH, False)
-    MAESTRO.set_target(BOTTOM_ARM, BOTTOM_FLUSH)
+    MAESTRO.execute_sequence([(TOP_ARM, TOP_FLUSH), (BOTTOM_ARM, BOTTOM_FLUSH)])
     time.sleep(DELAY)
 
 def extend_top():
-    MAESTRO.set_target(TOP_ARM, TOP_FORWARD)
+    MAESTRO.set_target(TOP_ARM, TOP_FORWARD, True)
     time.sleep(DELAY)
 
 def extend_bottom():
-    MAESTRO.set_target(BOTTOM_ARM, BOTTOM_FORWARD)
+    MAESTRO.set_target(BOTTOM_ARM, BOTTOM_FORWARD, True)
     time.sleep(DELAY)    
 
 def extend_left():
-    MAESTRO.set_target(LEFT_ARM, LEFT_FORWARD)
+    MAESTRO.set_target(LEFT_ARM, LEFT_FORWARD, True)
     time.sleep(DELAY)
 
 def extend_right():
-    MAESTRO.set_target(RIGHT_ARM, RIGHT_FORWARD)
+    MAESTRO.set_target(RIGHT_ARM, RIGHT_FORWARD, True)
     time.sleep(DELAY)
 
 def extend_sides():
-    MAESTRO.set_target(LEFT_ARM, LEFT_FORWARD, False)
-    MAESTRO.set_target(RIGHT_ARM, RIGHT_FORWARD)
+    MAESTRO.execute_sequence([(LEFT_ARM, LEFT_FORWARD), (RIGHT_ARM, RIGHT_FORWARD)])
     time.sleep(DELAY)
 
 def extend_verticals():
-    MAESTRO.set_target(TOP_ARM, TOP_FORWARD, False)
-    MAESTRO.set_target(BOTTOM_ARM, BOTTOM_FORWARD)
+    MAESTRO.execute_sequence([(TOP_ARM, TOP_FORWARD), (BOTTOM_ARM, BOTTOM_FORWARD)])
     time.sleep(DELAY)
 
 def turn_top_neutral():
-    MAESTRO.set_target(TOP_GRIP, TOP_NEUTRAL)
+    MAESTRO.set_target(TOP_GRIP, TOP_NEUTRAL, True)
     time.sleep(DELAY)
 
 def turn_top_clockwise_90():
@@ -165,7 +161,7 @@ def turn_top_clockwise_90():
             extend_right()
         else:
             turn_right_neutral()
-    MAESTRO.set_target(TOP_GRIP, TOP_CLOCKWISE)
+    MAESTRO.set_target(TOP_GRIP, TOP_CLOCKWISE, True)
     time.sleep(DELAY)
 
 def turn_top_180():
@@ -190,7 +186,7 @@ def turn_top_180():
             extend_right()
         else:
             turn_right_neutral()
-    MAESTRO.set_target(TOP_GRIP, TOP_180)
+    MAESTRO.set_target(TOP_GRIP, TOP_180, True)
     time.sleep(DELAY)
 
 def turn_top_counter_clockwise_90():
@@ -215,11 +211,11 @@ def turn_top_counter_clockwise_90():
             extend_right()
         else:
             turn_right_neutral()
-    MAESTRO.set_target(TOP_GRIP, TOP_COUNTERCLOCKWISE)
+    MAESTRO.set_target(TOP_GRIP, TOP_COUNTERCLOCKWISE, True)
     time.sleep(DELAY)
 
 def turn_bottom_neutral():
-    MAESTRO.set_target(BOTTOM_GRIP, BOTTOM_NEUTRAL)
+    MAESTRO.set_target(BOTTOM_GRIP, BOTTOM_NEUTRAL, True)
     time.sleep(DELAY)
 
 def turn_bottom_clockwise_90():
@@ -244,7 +240,7 @@ def turn_bottom_clockwise_90():
             extend_right()
         else:
             turn_right_neutral()
-    MAESTRO.set_target(BOTTOM_GRIP, BOTTOM_CLOCKWISE)
+    MAESTRO.set_target(BOTTOM_GRIP, BOTTOM_CLOCKWISE, True)
     time.sleep(DELAY)
 
 def turn_bottom_180():
@@ -269,7 +265,7 @@ def turn_bottom_180():
             extend_right()
         else:
             turn_right_neutral()
-    MAESTRO.set_target(BOTTOM_GRIP, BOTTOM_180)
+    MAESTRO.set_target(BOTTOM_GRIP, BOTTOM_180, True)
     time.sleep(DELAY)
 
 def turn_bottom_counter_clockwise_90():
@@ -294,11 +290,11 @@ def turn_bottom_counter_clockwise_90():
             extend_right()
         else:
             turn_right_neutral()
-    MAESTRO.set_target(BOTTOM_GRIP, BOTTOM_COUNTERCLOCKWISE)
+    MAESTRO.set_target(BOTTOM_GRIP, BOTTOM_COUNTERCLOCKWISE, True)
     time.sleep(DELAY)
 
 def turn_left_neutral():
-    MAESTRO.set_target(LEFT_GRIP, LEFT_NEUTRAL)
+    MAESTRO.set_target(LEFT_GRIP, LEFT_NEUTRAL, True)
     time.sleep(DELAY)
 
 def turn_left_clockwise_90():
@@ -323,7 +319,7 @@ def turn_left_clockwise_90():
             extend_bottom()
         else:
             turn_bottom_neutral()
-    MAESTRO.set_target(LEFT_GRIP, LEFT_CLOCKWISE)
+    MAESTRO.set_target(LEFT_GRIP, LEFT_CLOCKWISE, True)
     time.sleep(DELAY)
 
 def turn_left_180():
@@ -348,7 +344,7 @@ def turn_left_180():
             extend_bottom()
         else:
             turn_bottom_neutral()
-    MAESTRO.set_target(LEFT_GRIP, LEFT_180)
+    MAESTRO.set_target(LEFT_GRIP, LEFT_180, True)
     time.sleep(DELAY)
 
 def turn_left_counter_clockwise_90():
@@ -373,11 +369,11 @@ def turn_left_counter_clockwise_90():
             extend_bottom()
         else:
             turn_bottom_neutral()
-    MAESTRO.set_target(LEFT_GRIP, LEFT_COUNTERCLOCKWISE)
+    MAESTRO.set_target(LEFT_GRIP, LEFT_COUNTERCLOCKWISE, True)
     time.sleep(DELAY)
 
 def turn_right_neutral():
-    MAESTRO.set_target(RIGHT_GRIP, RIGHT_NEUTRAL)
+    MAESTRO.set_target(RIGHT_GRIP, RIGHT_NEUTRAL, True)
     time.sleep(DELAY)
 
 def turn_right_clockwise_90():
@@ -402,7 +398,7 @@ def turn_right_clockwise_90():
             extend_bottom()
         else:
             turn_bottom_neutral()
-    MAESTRO.set_target(RIGHT_GRIP, RIGHT_CLOCKWISE)
+    MAESTRO.set_target(RIGHT_GRIP, RIGHT_CLOCKWISE, True)
     time.sleep(DELAY)
 
 def turn_right_180():
@@ -427,7 +423,7 @@ def turn_right_180():
             extend_bottom()
         else:
             turn_bottom_neutral()
-    MAESTRO.set_target(RIGHT_GRIP, RIGHT_180)
+    MAESTRO.set_target(RIGHT_GRIP, RIGHT_180, True)
     time.sleep(DELAY)
 
 def turn_right_counter_clockwise_90():
@@ -452,7 +448,7 @@ def turn_right_counter_clockwise_90():
             extend_bottom()
         else:
             turn_bottom_neutral()
-    MAESTRO.set_target(RIGHT_GRIP, RIGHT_COUNTERCLOCKWISE)
+    MAESTRO.set_target(RIGHT_GRIP, RIGHT_COUNTERCLOCKWISE, True)
     time.sleep(DELAY)
 
 def open_arms():
@@ -489,13 +485,11 @@ def turn_cube_up():
         turn_right_counter_clockwise_90()
         extend_right()
     retract_verticals()
-    MAESTRO.set_target(LEFT_GRIP, LEFT_COUNTERCLOCKWISE, False)
-    MAESTRO.set_target(RIGHT_GRIP, RIGHT_NEUTRAL)
+    MAESTRO.execute_sequence([(LEFT_GRIP, LEFT_COUNTERCLOCKWISE), (RIGHT_GRIP, RIGHT_NEUTRAL)])
     time.sleep(DELAY)
     extend_verticals()
     retract_sides()
-    MAESTRO.set_target(LEFT_GRIP, LEFT_NEUTRAL, False)
-    MAESTRO.set_target(RIGHT_GRIP, RIGHT_NEUTRAL)
+    MAESTRO.execute_sequence([(LEFT_GRIP, LEFT_NEUTRAL), (RIGHT_GRIP, RIGHT_NEUTRAL)])
     time.sleep(DELAY)
     extend_sides()
     kociemba_map = {
@@ -548,13 +542,11 @@ def turn_cube_down():
         turn_right_neutral()
         extend_right()
     retract_verticals()
-    MAESTRO.set_target(LEFT_GRIP, LEFT_NEUTRAL, False)
-    MAESTRO.set_target(RIGHT_GRIP, RIGHT_COUNTERCLOCKWISE)
+    MAESTRO.execute_sequence([(LEFT_GRIP, LEFT_NEUTRAL), (RIGHT_GRIP, RIGHT_COUNTERCLOCKWISE)])
     time.sleep(DELAY)
     extend_verticals()
     retract_sides()
-    MAESTRO.set_target(LEFT_GRIP, LEFT_NEUTRAL, False)
-    MAESTRO.set_target(RIGHT_GRIP, RIGHT_NEUTRAL)
+    MAESTRO.execute_sequence([(LEFT_GRIP, LEFT_NEUTRAL), (RIGHT_GRIP, RIGHT_NEUTRAL)])
     time.sleep(DELAY)
     extend_sides()
     kociemba_map.update({
@@ -608,13 +600,11 @@ def turn_cube_left():
         turn_bottom_clockwise_90()
         extend_bottom()
     retract_sides()
-    MAESTRO.set_target(TOP_GRIP, TOP_CLOCKWISE, False)
-    MAESTRO.set_target(BOTTOM_GRIP, BOTTOM_NEUTRAL)
+    MAESTRO.execute_sequence([(TOP_GRIP, TOP_CLOCKWISE), (BOTTOM_GRIP, BOTTOM_NEUTRAL)])
     time.sleep(DELAY)
     extend_sides()
     retract_verticals()
-    MAESTRO.set_target(TOP_GRIP, TOP_NEUTRAL, False)
-    MAESTRO.set_target(BOTTOM_GRIP, BOTTOM_NEUTRAL)
+    MAESTRO.execute_sequence([(TOP_GRIP, TOP_NEUTRAL), (BOTTOM_GRIP, BOTTOM_NEUTRAL)])
     time.sleep(DELAY)
     extend_verticals()
     kociemba_map.update({
@@ -668,13 +658,11 @@ def turn_cube_right():
         turn_bottom_neutral()
         extend_bottom()
     retract_sides()
-    MAESTRO.set_target(TOP_GRIP, TOP_NEUTRAL, False)
-    MAESTRO.set_target(BOTTOM_GRIP, BOTTOM_CLOCKWISE)
+    MAESTRO.execute_sequence([(TOP_GRIP, TOP_NEUTRAL), (BOTTOM_GRIP, BOTTOM_CLOCKWISE)])
     time.sleep(DELAY)
     extend_sides()
     retract_verticals()
-    MAESTRO.set_target(TOP_GRIP, TOP_NEUTRAL, False)
-    MAESTRO.set_target(BOTTOM_GRIP, BOTTOM_NEUTRAL)
+    MAESTRO.execute_sequence([(TOP_GRIP, TOP_NEUTRAL), (BOTTOM_GRIP, BOTTOM_NEUTRAL)])
     time.sleep(DELAY)
     extend_verticals()
     kociemba_map.update({
@@ -764,62 +752,50 @@ def get_cube_state():
          os.mkdir(os.path.join(os.getcwd(), "CUBE_STATE"))
     extend_sides()
     retract_verticals()
-    MAESTRO.set_target(TOP_GRIP, TOP_COUNTERCLOCKWISE, False)
-    MAESTRO.set_target(BOTTOM_GRIP, BOTTOM_COUNTERCLOCKWISE)
+    MAESTRO.execute_sequence([(TOP_GRIP, TOP_COUNTERCLOCKWISE), (BOTTOM_GRIP, BOTTOM_COUNTERCLOCKWISE)])
     time.sleep(DELAY)    
     extend_verticals()
     retract_sides()
     take_picture(os.path.join(os.getcwd(), "CUBE_STATE", "rubiks-side-F.png"))
-    MAESTRO.set_target(TOP_GRIP, TOP_180, False)
-    MAESTRO.set_target(BOTTOM_GRIP, BOTTOM_NEUTRAL,)
+    MAESTRO.execute_sequence([(TOP_GRIP, TOP_180), (BOTTOM_GRIP, BOTTOM_NEUTRAL)])
     time.sleep(DELAY)
     extend_sides()
     retract_verticals()
-    MAESTRO.set_target(TOP_GRIP, TOP_COUNTERCLOCKWISE, False)
-    MAESTRO.set_target(BOTTOM_GRIP, BOTTOM_COUNTERCLOCKWISE)
+    MAESTRO.execute_sequence([(TOP_GRIP, TOP_COUNTERCLOCKWISE), (BOTTOM_GRIP, BOTTOM_COUNTERCLOCKWISE)])
     time.sleep(DELAY)  
     extend_verticals()
     retract_sides()
     take_picture(os.path.join(os.getcwd(), "CUBE_STATE", "rubiks-side-L.png"))
-    MAESTRO.set_target(TOP_GRIP, TOP_180, False)
-    MAESTRO.set_target(BOTTOM_GRIP, BOTTOM_NEUTRAL)
+    MAESTRO.execute_sequence([(TOP_GRIP, TOP_180), (BOTTOM_GRIP, BOTTOM_NEUTRAL)])
     time.sleep(DELAY)
     extend_sides()
     retract_verticals()
-    MAESTRO.set_target(TOP_GRIP, TOP_COUNTERCLOCKWISE, False)
-    MAESTRO.set_target(BOTTOM_GRIP, BOTTOM_COUNTERCLOCKWISE,)
+    MAESTRO.execute_sequence([(TOP_GRIP, TOP_COUNTERCLOCKWISE), (BOTTOM_GRIP, BOTTOM_COUNTERCLOCKWISE)])
     time.sleep(DELAY)  
     extend_verticals()
     retract_sides()
     take_picture(os.path.join(os.getcwd(), "CUBE_STATE", "rubiks-side-B.png"))
-    MAESTRO.set_target(TOP_GRIP, TOP_180, False)
-    MAESTRO.set_target(BOTTOM_GRIP, BOTTOM_NEUTRAL)
+    MAESTRO.execute_sequence([(TOP_GRIP, TOP_180), (BOTTOM_GRIP, BOTTOM_NEUTRAL)])
     time.sleep(DELAY)
     extend_sides()
     retract_verticals()
-    MAESTRO.set_target(TOP_GRIP, TOP_COUNTERCLOCKWISE, False)
-    MAESTRO.set_target(BOTTOM_GRIP, BOTTOM_COUNTERCLOCKWISE)
+    MAESTRO.execute_sequence([(TOP_GRIP, TOP_COUNTERCLOCKWISE), (BOTTOM_GRIP, BOTTOM_COUNTERCLOCKWISE)])
     time.sleep(DELAY)  
     extend_verticals()
     retract_sides()
     take_picture(os.path.join(os.getcwd(), "CUBE_STATE", "rubiks-side-R.png"))
-    MAESTRO.set_target(TOP_GRIP, TOP_180, False)
-    MAESTRO.set_target(BOTTOM_GRIP, BOTTOM_NEUTRAL)
+    MAESTRO.execute_sequence([(TOP_GRIP, TOP_180), (BOTTOM_GRIP, BOTTOM_NEUTRAL)])
     time.sleep(DELAY)
     extend_sides()
     retract_verticals()
-    MAESTRO.set_target(TOP_GRIP, TOP_NEUTRAL, False)
-    MAESTRO.set_target(BOTTOM_GRIP, BOTTOM_NEUTRAL)
+    MAESTRO.execute_sequence([(TOP_GRIP, TOP_NEUTRAL), (BOTTOM_GRIP, BOTTOM_NEUTRAL)])
     time.sleep(DELAY)
-    MAESTRO.set_target(LEFT_GRIP, LEFT_COUNTERCLOCKWISE, False)
-    MAESTRO.set_target(RIGHT_GRIP, RIGHT_CLOCKWISE)
+    MAESTRO.execute_sequence([(LEFT_GRIP, LEFT_COUNTERCLOCKWISE), (RIGHT_GRIP, RIGHT_CLOCKWISE)])
     time.sleep(DELAY)
     take_picture(os.path.join(os.getcwd(), "CUBE_STATE", "rubiks-side-D.png"))
-    MAESTRO.set_target(LEFT_GRIP, LEFT_CLOCKWISE, False)
-    MAESTRO.set_target(RIGHT_GRIP, RIGHT_COUNTERCLOCKWISE)  
+    MAESTRO.execute_sequence([(LEFT_GRIP, LEFT_CLOCKWISE), (RIGHT_GRIP, RIGHT_COUNTERCLOCKWISE)])
     take_picture(os.path.join(os.getcwd(), "CUBE_STATE", "rubiks-side-U.png"))
-    MAESTRO.set_target(LEFT_GRIP, LEFT_NEUTRAL, False)
-    MAESTRO.set_target(RIGHT_GRIP, RIGHT_NEUTRAL)
+    MAESTRO.execute_sequence([(LEFT_GRIP, LEFT_NEUTRAL), (RIGHT_GRIP, RIGHT_NEUTRAL)])
     extend_verticals()
 
     for (side_index, side_name) in enumerate(('U', 'L', 'F', 'R', 'B', 'D')):
@@ -42,29 +42,69 @@
 # (C) 2010 Juhapekka Piiroinen
 #          Brian Wu
 ############################################################################################
+import errno
+import os
+import select
 import serial
+import struct
 import time
 
+############################################################################################
+# Compact protocol command bytes
+_CMD_BAUD_INDICATION = 0xAA
+_CMD_SET_TARGET = 0x84
+_CMD_SET_SPEED = 0x87
+_CMD_SET_ACCELERATION = 0x89
+_CMD_GET_POSITION = 0x90
+_CMD_GET_MOVING_STATE = 0x93
+_CMD_SET_MULTIPLE_TARGETS = 0x9F
+_CMD_GET_ERRORS = 0xA1
+_CMD_GO_HOME = 0xA2
+
+############################################################################################
+# Target, speed and acceleration values are sent as (value & 31) << 2, value >> 5 (bits 0-6 and 7-13 of value*4).
+# Both bytes have to stay below 0x80, so only values 0-4095 can be encoded; all of them are computed once here,
+# each as the little-endian 16-bit word holding both bytes so it can be struct.pack_into'ed ('<H') straight into a buffer.
+_ENC = [((v & 31) << 2) | ((v >> 5) << 8) for v in range(4096)]
+
+def _encode(value):
+    # plain list indexing would wrap negative values around to the top of the range, so check explicitly
+    if not 0 <= value < len(_ENC):
+        raise ValueError("value %s out of range (0-%d)" % (value, len(_ENC)-1))
+    return _ENC[value]
+
 def log(*msgline):
     for msg in msgline:
         print msg,
     print
 
 class Device(object):
-    def __init__(self,con_port="/dev/ttyACM1",ser_port="/dev/ttyACM0",timeout=1): #/dev/ttyACM0  and   /dev/ttyACM1  for Linux
+    """Wrapper for a Pololu Maestro on its USB Dual Port serial links.
+
+    Commands are written without waiting for them to leave the port (no flush/tcdrain per command); the
+    Maestro buffers them itself. The port is only flushed, through _flush(), right before reading a reply,
+    so anything that needs the device to have seen the commands must go through one of the get_* / poll
+    functions (wait_until_at_target does).
+    """
+    def __init__(self,con_port="/dev/ttyACM1",ser_port="/dev/ttyACM0",timeout=1,baudrate=200000): #/dev/ttyACM0  and   /dev/ttyACM1  for Linux
         ############################
         # lets introduce and init the main variables
         self.con = None
         self.ser = None
         self.isInitialized = False
+        self._needs_flush = False
+        self._writable = False
+        self._fd = None
+        # error flags cleared on the device by poll_status but not reported yet through get_errors
+        self._err_flags = 0
+        # reusable transmit buffer for write(), so no new buffer is allocated per command
+        self._txbuf = bytearray(256)
+        self._txview = memoryview(self._txbuf)
         
         ############################
         # lets connect the TTL Port
         try:
-            self.con = serial.Serial(con_port,timeout=timeout)
-            #self.con.baudrate = 9600
-            self.con.close()
-            self.con.open()
+            self.con = serial.Serial(port=con_port,baudrate=baudrate,timeout=timeout,write_timeout=timeout,exclusive=True)
             log("Link to Command Port -", con_port, "- successful")
 
         except serial.serialutil.SerialException, e:
@@ -77,24 +117,38 @@ class Device(object):
             #the RX line before sending any commands. The 0xAA baud rate indication byte can be the first byte of a Pololu protocol
             #command.
             #http://www.pololu.com/docs/pdf/0J40/maestro.pdf - page 35
-            self.con.write(chr(0xAA))
+            self.con.write(struct.pack('<B', _CMD_BAUD_INDICATION))
             self.con.flush()
             log("Baud rate indication byte 0xAA sent!")
         
         ###################################
         # lets connect the TTL Port
         try:
-            self.ser = serial.Serial(ser_port,timeout=timeout)
-            #self.ser.baudrate = 9600
-            self.ser.close()
-            self.ser.open()
+            # 200000 is the fastest rate the Maestro supports. Both ports use the same rate, and the commands go out on this one,
+            # so it gets its own 0xAA below for the Maestro's "detect baud rate" mode to lock onto.
+            self.ser = serial.Serial(port=ser_port,baudrate=baudrate,timeout=timeout,write_timeout=timeout,exclusive=True)
             log("Link to TTL Port -", ser_port, "- successful")
+            self.ser.write(struct.pack('<B', _CMD_BAUD_INDICATION))
+            self.ser.flush()
+            log("Baud rate indication byte 0xAA sent on TTL Port!")
         except serial.serialutil.SerialException, e:
             print e
             log("Link to TTL Port -", ser_port, "- failed!")
         
         self.isInitialized = (self.con!=None and self.ser!=None)
         if (self.isInitialized):
+            ############################
+            # the port state is checked once here and cached for write()
+            self._writable = self.ser.writable()
+            if self._writable:
+                # POSIX ports expose their file descriptor, the get_* requests use it directly (see _txrx)
+                try:
+                    self._fd = self.ser.fileno()
+                except (AttributeError, IOError, ValueError):
+                    # e.g. Windows ports have no usable file descriptor
+                    self._fd = None
+            else:
+                log("Device not writable")
             err_flags = self.get_errors()
             log("Device error flags read (",err_flags,") and cleared")
         log("Device initialized:",self.isInitialized)
@@ -102,19 +156,108 @@ class Device(object):
     ###########################################################################################################################
     ## common write function for handling all write related tasks
     def write(self,*data):
+        # collect everything into the transmit buffer so the whole command goes out in a single write
+        n = 0
+        for d in data:
+            if type(d) is list or isinstance(d, (bytes, bytearray)):
+                # Handling for writing to multiple servos at same time, or an already packed command
+                end = n+len(d)
+                if end > len(self._txbuf):
+                    self._grow_txbuf(end)
+                self._txbuf[n:end] = d
+                n = end
+            else:
+                if n >= len(self._txbuf):
+                    self._grow_txbuf(n+1)
+                self._txbuf[n] = d
+                n += 1
+
+        self._send(n)
+
+    ## sends the first n bytes of the transmit buffer
+    def _send(self,n):
         if not self.isInitialized: log("Not initialized"); return
-        if not self.ser.writable():
+        if not self._writable:
             log("Device not writable")
             return
-        for d in data:
-            if type(d) is list:
-                # Handling for writing to multiple servos at same time
-                for li in d:
-                    self.ser.write(chr(li))
-            else:
-                self.ser.write(chr(d))
+        # the Maestro buffers commands itself, so don't wait for the bytes to leave here;
+        # _flush() does that before we block on a reply or on the servos
+        self.ser.write(self._txview[:n])
+        self._needs_flush = True
 
-        self.ser.flush()
+    ## packs a command, channel, encoded value quadruple (Set Target/Speed/Acceleration) into the transmit buffer at offset
+    def _pack_command(self,offset,command,channel,value):
+        struct.pack_into('<BBH', self._txbuf, offset, command, channel, _encode(value))
+
+    def _grow_txbuf(self,size):
+        # a bytearray with a memoryview on it can't be resized, so swap in a bigger one (keeping what is already filled in)
+        txbuf = bytearray(max(size, 2*len(self._txbuf)))
+        txbuf[:len(self._txbuf)] = self._txbuf
+        self._txbuf = txbuf
+        self._txview = memoryview(txbuf)
+
+    def _flush(self):
+        if self._needs_flush:
+            self.ser.flush()
+            self._needs_flush = False
+
+    ###########################################################################################################################
+    ## common request/reply function for the get_* commands
+    # Sends the request and reads up to nread reply bytes, waiting at most the port timeout. When the port's file descriptor
+    # is available this goes straight through os.write/os.read, skipping pyserial's read/write layers; otherwise it falls
+    # back to write() and ser.read().
+    def _txrx(self,request,nread):
+        if self._fd is None:
+            self.write(request)
+            self._flush()
+            return bytearray(self.ser.read(nread))
+
+        self._flush()
+        # the fd is non-blocking, so os.write may take only part of the request; keep going until it is all out
+        write_timeout = self.ser.write_timeout
+        deadline = None if write_timeout is None else time.time()+write_timeout
+        sent = 0
+        while sent < len(request):
+            remaining = None if deadline is None else max(0, deadline-time.time())
+            try:
+                ready = select.select([],[self._fd],[],remaining)[1]
+            except select.error, e:
+                # interrupted by a signal, just try again
+                if e.args[0] != errno.EINTR:
+                    raise
+                continue
+            if not ready:
+                raise serial.SerialTimeoutException("Write timeout")
+            try:
+                sent += os.write(self._fd, request[sent:])
+            except OSError, e:
+                if e.errno not in (errno.EAGAIN, errno.EINTR):
+                    raise
+
+        data = bytearray()
+        timeout = self.ser.timeout
+        deadline = None if timeout is None else time.time()+timeout
+        while len(data) < nread:
+            remaining = None if deadline is None else max(0, deadline-time.time())
+            try:
+                ready = select.select([self._fd],[],[],remaining)[0]
+            except select.error, e:
+                if e.args[0] != errno.EINTR:
+                    raise
+                continue
+            if not ready:
+                break
+            try:
+                chunk = os.read(self._fd, nread-len(data))
+            except OSError, e:
+                # the fd can still turn out empty after select said it was readable
+                if e.errno not in (errno.EAGAIN, errno.EINTR):
+                    raise
+                continue
+            if not chunk:
+                break
+            data.extend(chunk)
+        return data
 
     ###########################################################################################################################
     ## Go Home
@@ -126,7 +269,7 @@ class Device(object):
     # Source: http://www.pololu.com/docs/pdf/0J40/maestro.pdf
     def go_home(self):
         if not self.isInitialized: log("Not initialized"); return
-        self.write(0xA2)
+        self.write(_CMD_GO_HOME)
 
     ###########################################################################################################################
     ## Set Target
@@ -136,12 +279,12 @@ class Device(object):
     # fourth data byte represent bits 7-13 of the target. The target is a non-negative integer.
     # --
     # Source: http://www.pololu.com/docs/pdf/0J40/maestro.pdf
-    def set_target(self,servo,value, wait=True):
+    def set_target(self,servo,value, wait=False, poll_interval=None):
         if not self.isInitialized: log("Not initialized"); return
-        highbits,lowbits = divmod(value,32)
-        self.write(0x84,servo,lowbits << 2,highbits)
+        self._pack_command(0,_CMD_SET_TARGET,servo,value)
+        self._send(4)
         if wait:
-            self.wait_until_at_target()
+            return self.wait_until_at_target(poll_interval)
 
     ##########################################################################################################################
     ## Set Targets
@@ -154,20 +297,77 @@ class Device(object):
     # by channel number, in the same format as the Set Target command above.
     # --
     # Source: http://www.pololu.com/docs/pdf/0J40/maestro.pdf
-    def set_targets(self,num_targets,start_channel,values, wait=True):
+    def set_targets(self,num_targets,start_channel,values, wait=False, poll_interval=None):
         if not self.isInitialized: log("Not initialized"); return
-        result = []
-        for k in range(num_targets):
-            highbits,lowbits = divmod(values[k],32)
-            result.append(lowbits << 2)
-            result.append(highbits)
+        # the header announces num_targets values, sending fewer would make the Maestro read the next command as targets
+        if len(values) < num_targets:
+            raise ValueError("set_targets: %d targets announced but only %d values given" % (num_targets, len(values)))
+        values = values[:num_targets]
+        # check the range once (min/max run in C) so the lookups below can index _ENC directly
+        if values and (min(values) < 0 or max(values) >= len(_ENC)):
+            raise ValueError("set_targets: values %s out of range (0-%d)" % (values, len(_ENC)-1))
 
+        # a list of channels is accepted for convenience, callers that already know the first channel should pass it as an int
         if type(start_channel) is list:
             start_channel = min(start_channel)
 
-        self.write(0x9F,num_targets,start_channel,result)
+        # header and encoded values are packed straight into the transmit buffer
+        size = 3+2*num_targets
+        if size > len(self._txbuf):
+            self._grow_txbuf(size)
+        struct.pack_into('<BBB%dH' % num_targets, self._txbuf, 0, _CMD_SET_MULTIPLE_TARGETS, num_targets, start_channel,
+                         *map(_ENC.__getitem__, values))
+        self._send(size)
+        if wait:
+            return self.wait_until_at_target(poll_interval)
+
+    ###########################################################################################################################
+    ## Set Any Targets
+    # Sets targets for any set of channels from a list of (channel, value) pairs. The channels are sorted and split into
+    # contiguous blocks; each block is sent as one Set Multiple Targets command (or a plain Set Target if it is a single
+    # channel), and all of them go out in a single write. If a channel is given more than once the last value wins.
+    def set_any_targets(self,pairs, wait=False, poll_interval=None):
+        if not self.isInitialized: log("Not initialized"); return
+        targets = sorted(dict(pairs).items())
+        if not targets: return
+
+        blocks = [[targets[0]]]
+        for channel,value in targets[1:]:
+            if channel == blocks[-1][-1][0]+1:
+                blocks[-1].append((channel,value))
+            else:
+                blocks.append([(channel,value)])
+
+        # everything is packed straight into the transmit buffer: 4 bytes for a single channel, 3 + 2 per channel for a block
+        size = sum([4 if len(block) == 1 else 3+2*len(block) for block in blocks])
+        if size > len(self._txbuf):
+            self._grow_txbuf(size)
+        offset = 0
+        for block in blocks:
+            if len(block) == 1:
+                self._pack_command(offset,_CMD_SET_TARGET,block[0][0],block[0][1])
+                offset += 4
+            else:
+                struct.pack_into('<BBB', self._txbuf, offset, _CMD_SET_MULTIPLE_TARGETS, len(block), block[0][0])
+                offset += 3
+                for channel,value in block:
+                    struct.pack_into('<H', self._txbuf, offset, _encode(value))
+                    offset += 2
+
+        self._send(size)
         if wait:
-            self.wait_until_at_target()
+            return self.wait_until_at_target(poll_interval)
+
+    ###########################################################################################################################
+    ## Execute Sequence
+    # Sends a list of (servo, value) Set Target commands back to back without waiting in between, then waits once
+    # for all of them to finish moving. Returns the error flags seen while waiting.
+    def execute_sequence(self,moves, poll_interval=None, idle_callback=None):
+        if not self.isInitialized: log("Not initialized"); return
+        for servo,value in moves:
+            self.set_target(servo,value)
+        return self.wait_until_at_target(poll_interval, idle_callback)
+
     ###########################################################################################################################
     ## Set Speed
     # Compact protocol: 0x87, channel number, speed low bits, speed high bits
@@ -187,24 +387,24 @@ class Device(object):
     # Source: http://www.pololu.com/docs/pdf/0J40/maestro.pdf
     def set_speed(self,servo,speed):
         if not self.isInitialized: log("Not initialized"); return
-        highbits,lowbits = divmod(speed,32)
-        self.write(0x87,servo,lowbits << 2,highbits)
+        self._pack_command(0,_CMD_SET_SPEED,servo,speed)
+        self._send(4)
 
     def set_speeds(self,servos,speeds):
         if not self.isInitialized: log("Not initialized"); return
-        index = 0
-        for s in servos:
-            if type(speeds) is list:
-                highbits,lowbits = divmod(speeds[index],32)
-                self.write(0x87,s,lowbits << 2,highbits)
-                #log("MULTI: channel %s; speed %s"%(s,speeds[index]))
-                index += 1
-            elif type(speeds) is int:
-                highbits,lowbits = divmod(speeds,32)
-                self.write(0x87,s,lowbits << 2,highbits)
-                #log("SINGLE: channel %s; speed %s"%(s,speeds))
-            else:
-                log("Set Speed: <Type> Error"); return
+        if type(speeds) is int:
+            speeds = [speeds]*len(servos)
+        elif type(speeds) is not list:
+            log("Set Speed: <Type> Error"); return
+
+        # one Set Speed command per servo, all sent in a single write
+        if 4*len(servos) > len(self._txbuf):
+            self._grow_txbuf(4*len(servos))
+        for index,s in enumerate(servos):
+            self._pack_command(4*index,_CMD_SET_SPEED,s,speeds[index])
+            #log("channel %s; speed %s"%(s,speeds[index]))
+
+        self._send(4*len(servos))
   
     ###########################################################################################################################
     ## Set Acceleration
@@ -223,8 +423,8 @@ class Device(object):
     # Source: http://www.pololu.com/docs/pdf/0J40/maestro.pdf
     def set_acceleration(self,servo,acceleration):
         if not self.isInitialized: log("Not initialized"); return
-        highbits,lowbits = divmod(acceleration,32)
-        self.write(0x89,servo,lowbits << 2,highbits)
+        self._pack_command(0,_CMD_SET_ACCELERATION,servo,acceleration)
+        self._send(4)
 
     ###########################################################################################################################
     ## Set PWM (Mini Maestro 12, 18, and 24 only)
@@ -266,21 +466,24 @@ class Device(object):
     # Source: http://www.pololu.com/docs/pdf/0J40/maestro.pdf
     def get_position(self,servo):
         if not self.isInitialized: log("Not initialized"); return None
-        self.write(0x90,servo)
-        data = self.ser.read(2)
-        if data:
-            return (ord(data[0])+(ord(data[1])<<8))/4
+        data = self._txrx(struct.pack('<BB', _CMD_GET_POSITION, servo), 2)
+        if len(data) == 2:
+            return (data[0]+(data[1]<<8))//4
         else:
             return None
 
     def get_positions(self,servos):
         if not self.isInitialized: log("Not initialized"); return None
-        result = []
+        # send every Get Position request in one go, then read all the replies back together
+        request = bytearray()
         for s in servos:
-            self.write(0x90,s)
-            data = self.ser.read(2)
-            if data:
-                result.append( (ord(data[0])+(ord(data[1])<<8))/4 )
+            request.extend((_CMD_GET_POSITION,s))
+        data = self._txrx(bytes(request), 2*len(servos))
+
+        result = []
+        for i in range(len(servos)):
+            if len(data) >= 2*i+2:
+                result.append( (data[2*i]+(data[2*i+1]<<8))//4 )
             else:
                 result.append( None )
 
@@ -298,10 +501,9 @@ class Device(object):
     # Source: http://www.pololu.com/docs/pdf/0J40/maestro.pdf
     def get_moving_state(self):
         if not self.isInitialized: log("Not initialized"); return None
-        self.write(0x93)
-        data = self.ser.read(1)
+        data = self._txrx(struct.pack('<B', _CMD_GET_MOVING_STATE), 1)
         if data:
-            return ord(data[0])
+            return data[0]
         else:
             return None
 
@@ -317,28 +519,86 @@ class Device(object):
     # then all the error bits are cleared. For most applications using serial control, it is a good idea to check errors continuously
     # and take appropriate action if errors occur.
     # --
+    # --
+    # Flags already read (and so cleared on the device) by poll_status are included until get_errors reports them.
+    # --
     # Source: http://www.pololu.com/docs/pdf/0J40/maestro.pdf
     def get_errors(self):
         if not self.isInitialized: log("Not initialized"); return None
-        self.write(0xA1)
-        data = self.ser.read(2)
-        if data:
-            return ord(data[0])+(ord(data[1])<<8)
+        data = self._txrx(struct.pack('<B', _CMD_GET_ERRORS), 2)
+        err_flags, self._err_flags = self._err_flags, 0
+        if len(data) == 2:
+            return err_flags | (data[0]+(data[1]<<8))
         else:
-            return None
+            return err_flags or None
+
+    ###########################################################################################################################
+    ## Poll Status
+    # Get Moving State (0x93) and Get Errors (0xA1) sent back to back
+    # Response: moving state, error bits 0-7, error bits 8-15
+    # --
+    # Both replies come back in one read, so checking the moving state also reads (and clears) the error flags
+    # without a second round-trip. Returns (moving state, error flags), or (None, None) if the reply timed out.
+    # The flags are also kept for the next get_errors call, so clearing them here doesn't lose them.
+    def poll_status(self):
+        if not self.isInitialized: log("Not initialized"); return None, None
+        data = self._txrx(struct.pack('<BB', _CMD_GET_MOVING_STATE, _CMD_GET_ERRORS), 3)
+        if len(data) == 3:
+            errors = data[1]+(data[2]<<8)
+            self._err_flags |= errors
+            return data[0], errors
+        else:
+            return None, None
 
     ###########################################################################################################################
     ## a helper function for Set Target
-    def wait_until_at_target(self):
-        while (self.get_moving_state()):
-            time.sleep(0.1)
+    # polls the moving state starting at poll_interval seconds (2 ms by default) and backs off
+    # up to 50 ms, so short moves are not held up by a long fixed sleep.
+    # If idle_callback is given it is called between polls, so the caller can get other work done (e.g. image
+    # processing) while the servos are still moving; whatever is left of the poll delay afterwards is still slept.
+    # Every poll also clears the error flags on the device; the ones seen while waiting are returned (and still
+    # reported by the next get_errors).
+    def wait_until_at_target(self, poll_interval=None, idle_callback=None):
+        err_flags = 0
+        delay = poll_interval or 0.002
+        while True:
+            moving,errors = self.poll_status()
+            if errors:
+                err_flags |= errors
+            if not moving:
+                break
+            if idle_callback:
+                start = time.time()
+                idle_callback()
+                remaining = delay - (time.time()-start)
+                if remaining > 0:
+                    time.sleep(remaining)
+            else:
+                time.sleep(delay)
+            delay = min(delay*1.5, max(0.05, delay))
+        return err_flags
 
     ###########################################################################################################################
     ## Lets close and clean when we are done
+    # this can run during interpreter shutdown with the ports half torn down, so never raise and never block here.
+    # Commands still queued in the OS output buffer are thrown away rather than drained, anything that has to reach the
+    # Maestro must be followed by a get_*/wait call (which flushes) before the Device goes away.
     def __del__(self):
-        if (self.ser):
-            self.ser.close()
-        if (self.con):
-            self.con.close()
-        del(self.ser)
-        del(self.con)
+        for name in ("ser","con"):
+            port = getattr(self, name, None)
+            if port is None:
+                continue
+            try:
+                port.cancel_write()
+                port.cancel_read()
+            except Exception:
+                pass
+            try:
+                # otherwise close() waits for the tty to drain (closing_wait)
+                port.reset_output_buffer()
+            except Exception:
+                pass
+            try:
+                port.close()
+            except Exception:
+                pass